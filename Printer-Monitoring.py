@@ -28,14 +28,31 @@ __service__ = 'PrinterMonitoring'
 
 
 from pysnmp.entity.rfc3413.oneliner import cmdgen
-from pysnmp.proto import rfc1905
+from pysnmp.error import PySnmpError
+from pysnmp.proto import rfc1905, errind
+from pysnmp.smi import builder, view
+from pysnmp.smi.rfc1902 import ObjectIdentity
+from pyasn1.type import univ
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 import argparse
+import ipaddress
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import codecs
+import gzip
+import orjson
+import threading
 
 import os
+import sys
+import atexit
+import queue
+import signal
 from enum import Enum
+from typing import Optional
 import logging
 import logging.handlers
 
@@ -50,25 +67,100 @@ PROXIES = {
     'http':'',
     'https':'',
 }
+MAX_WORKERS = 16  # Anzahl parallel abgefragter Drucker
+REPORT_WORKERS = 4  # Anzahl parallel gesendeter Reports an das Backend
+# SNMP Timeout (Sekunden) und Wiederholungen pro Request; ein nicht erreichbarer
+# Drucker kostet so höchstens SNMP_TIMEOUT * (SNMP_RETRIES + 1) Sekunden
+SNMP_TIMEOUT = 1
+SNMP_RETRIES = 1
+NO_OID = '1.3.6.1'  # Platzhalter-OID der Varianten für "nicht vorhanden"
+NO_SNMP_VALUE = (rfc1905.NoSuchInstance, rfc1905.NoSuchObject)  # Antworten ohne Wert an der OID
+GZIP = False  # Reports gzip-komprimiert senden; per Config "gzip" aktivierbar
 
-os.chdir(os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__))))
 LOG_LEVEL = logging.INFO  # logging.DEBUG // .ERROR...
 LOG_FILE = 'RauSys-Monitoring.log'
-LOG_PATH = os.path.join(os.getcwd(), LOG_FILE)
-logging.basicConfig(
-    format='%(asctime)s - [%(levelname)s] %(message)s',
-    level=LOG_LEVEL,
-    handlers=[
+CONFIG_FILE = 'printer_config.txt'
+
+logger = logging.getLogger(__name__)
+_thread_local = threading.local()
+_mib_lock = threading.Lock()
+# Pfad -> (Änderungszeitpunkt, Konfiguration), siehe _load_config
+_config_cache = {}
+
+
+def get_command_generator() -> cmdgen.CommandGenerator:
+    """ Gibt den CommandGenerator des aktuellen Threads zurück; der Aufbau
+    (SNMP Engine, MIB Loader, Dispatcher) ist teuer und die Engine nicht
+    threadsicher, daher wird ein Generator pro Thread wiederverwendet """
+    if not hasattr(_thread_local, 'cmdgen'):
+        _thread_local.cmdgen = cmdgen.CommandGenerator()
+    return _thread_local.cmdgen
+
+
+def get_session() -> requests.Session:
+    """ Gibt die requests.Session des aktuellen Threads zurück; Verbindungen
+    zum Backend werden so wiederverwendet statt pro Report einen neuen
+    TCP+TLS Handshake durchzuführen, ohne eine Session zwischen Threads
+    zu teilen """
+    if not hasattr(_thread_local, 'session'):
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.2)))
+        session.headers.update(HEADERS)
+        _thread_local.session = session
+    return _thread_local.session
+
+
+@lru_cache(maxsize=1)
+def _mib_view_controller() -> view.MibViewController:
+    """ MIB View für das Auflösen der OIDs; wird erst bei der ersten
+    Abfrage aufgebaut, damit ein Import keine MIBs lädt """
+    return view.MibViewController(builder.MibBuilder())
+
+
+@lru_cache(maxsize=None)
+def object_identity(oid: str) -> ObjectIdentity:
+    """ Gibt die aufgelöste ObjectIdentity zur OID zurück; jede OID wird
+    nur einmal geparst und aufgelöst statt bei jedem getCmd/bulkCmd """
+    with _mib_lock:
+        return ObjectIdentity(oid).resolveWithMib(_mib_view_controller())
+
+
+def _configure_logging() -> logging.handlers.QueueListener:
+    """ Richtet Konsolen- und Datei-Logging ein; wird erst beim Start des
+    Skripts aufgerufen, damit ein Import keine Logdatei anlegt """
+    # Log Einträge werden nur in eine Queue gestellt; Schreiben auf Konsole und
+    # (rotierende) Logdatei übernimmt ein Hintergrund-Thread, damit die
+    # SNMP Abfragen nicht auf Datei-I/O warten
+    log_queue = queue.Queue(-1)
+    logging.basicConfig(
+        format='%(asctime)s - [%(levelname)s] %(message)s',
+        level=LOG_LEVEL,
+        handlers=[
+            logging.handlers.QueueHandler(log_queue)
+        ]
+    )
+    listener = logging.handlers.QueueListener(
+        log_queue,
         logging.StreamHandler(),
         logging.handlers.RotatingFileHandler(
-            LOG_PATH,
+            os.path.join(os.getcwd(), LOG_FILE),
             maxBytes=5000000,   # 10 MB
             backupCount=3
-        )
-    ]
-)
+        ),
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
-logger = logging.getLogger(__name__)
+
+def parse_count(value) -> Optional[int]:
+    """ Zählerstand als int; manche Drucker liefern Zähler als Zeichenkette
+    (OctetString/Opaque), nicht numerische oder fehlende Werte ergeben None """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 class PrinterConsumable():
@@ -88,28 +180,51 @@ class PrinterConsumable():
         MAGENTA_DRUM = 'MAGENTA_DRUM'
         YELLOW_DRUM = 'YELLOW_DRUM'
 
-    def __init__(self, name, capacity, remaining, type):
-        logger.debug(f'|--> {type} {name}')
+    __slots__ = ('name', 'capacity', 'remaining', 'type', 'percentage')
+
+    name: Optional[str]
+    capacity: Optional[int]
+    remaining: Optional[int]
+    type: str
+    percentage: Optional[int]
+
+    def __init__(self, name: Optional[str], capacity: Optional[int], remaining: Optional[int],
+                 consumable_type: Consumable):
+        logger.debug(f'|--> {consumable_type} {name}')
         self.name = name
-        self.capacity = int(capacity) if capacity and capacity.isdigit() else None
-        self.remaining = int(remaining) if isinstance(remaining, str) and remaining.isdigit() else None  # can be 0
-        self.type = type.value
+        # Werte kommen bereits als int von Printer.parse_snmp_value; negative
+        # Werte sind Printer-MIB Sonderwerte (-2 unbekannt, -3 Rest vorhanden)
+        self.capacity = capacity if isinstance(capacity, int) and capacity >= 0 else None
+        self.remaining = remaining if isinstance(remaining, int) and remaining >= 0 else None  # can be 0
+        self.type = consumable_type.value
+        # einmalig berechnen; wird für Ausgabe und Report wiederverwendet
+        self.percentage = self.compute_percentage(self.capacity, self.remaining)
         if not self.initialized: logger.warning(f'{self} did not initialize properly!')
+        elif self.anomalous: logger.warning(f'{self} reports more remaining ({self.remaining}) than capacity!')
+
+    def to_json(self) -> dict:
+        return {'name': self.name, 'capacity': self.capacity, 'remaining': self.remaining, 'type': self.type,
+                'percentage': self.percentage}
 
     def __str__(self) -> str:
         if not self.initialized: return f'[{self.type}] – no data –'
         return f'[{self.type}] {self.name} ({self.remaining}/{self.capacity}) {self.percentage}%'
 
+    @staticmethod
+    def compute_percentage(capacity: Optional[int], remaining: Optional[int]) -> Optional[int]:
+        if remaining is None or not capacity: return None
+        # Ganzzahlarithmetik; inkonsistente Werte werden auf 0-100 begrenzt
+        # statt das Verhältnis umzukehren (siehe anomalous)
+        return max(0, min(100, (remaining * 100) // capacity))
+
     @property
-    def percentage(self) -> int:
-        if self.remaining is None or self.capacity is None: return None
-        z = self.remaining / self.capacity
-        if z > 1 or z < 0:
-            z = self.capacity / self.remaining
-        return int(round(z,2)*100)
+    def anomalous(self) -> bool:
+        """ Drucker meldet mehr Restmenge als Kapazität """
+        if self.remaining is None or self.capacity is None: return False
+        return self.remaining > self.capacity
 
     @property
-    def initialized(self):
+    def initialized(self) -> Optional[int]:
         """ Hilfsfunktion um zu evaluieren, ob Consumable vollständig
         initialisiert wurde oder nicht """
         return self.capacity
@@ -183,7 +298,50 @@ class Printer():
     oid_yellow_drum_capacity = '1.3.6.1.2.1.43.11.1.1.8.1.8'
     oid_yellow_drum_remaining = '1.3.6.1.2.1.43.11.1.1.9.1.8'
 
-    def __init__(self, ip, description, kunde, serial, *args, port=161, community='public', **kwargs):
+    # Printer-MIB prtMarkerSuppliesEntry Spalten (Name, Kapazität, Restmenge)
+    oid_supplies_columns = (
+        '1.3.6.1.2.1.43.11.1.1.6.1',
+        '1.3.6.1.2.1.43.11.1.1.8.1',
+        '1.3.6.1.2.1.43.11.1.1.9.1',
+    )
+
+    # Maximale Anzahl OIDs pro SNMP Request (Antwortgröße bleibt so
+    # auch bei langen Verbrauchsmaterialnamen unter der MTU)
+    snmp_max_oids = 16
+    # Zeilen pro GETBULK Antwort beim Walk der Supplies-Spalten
+    snmp_max_repetitions = 25
+
+    # Verbrauchsmaterialien, die über die oid_<consumable>_*_manual OIDs
+    # mit manuell überschriebenem Typ initialisiert werden
+    MANUAL_CONSUMABLES = []
+
+    # Skalare Werte, die initialize_values abfragt: (Attribut, OID-Attribut)
+    scalar_fields = (
+        ('name', 'oid_printer_name'),
+        ('model', 'oid_printer_model'),
+        #('serial', 'oid_printer_serial'),
+        ('meta', 'oid_printer_meta'),
+        ('print_count', 'oid_print_count'),
+        ('print_color', 'oid_print_color'),
+        ('print_mono', 'oid_print_mono'),
+    )
+
+    # Felder, die an das Backend gemeldet werden (zzgl. consumables)
+    report_fields = (
+        'ip', 'kunde', 'serial', 'description', 'variant', 'port', 'community', 'version', 'status',
+        'name', 'model', 'meta', 'print_count', 'print_color', 'print_mono',
+    )
+
+    # Instanzattribute fest statt __dict__ je Drucker; Varianten ergänzen
+    # keine eigenen und deklarieren ein leeres __slots__
+    __slots__ = (
+        'ip', 'kunde', 'serial', 'description', 'variant', 'port', 'community', 'version', 'status',
+        'name', 'model', 'meta', 'print_count', 'print_color', 'print_mono', 'consumables',
+        '_auth', '_transport', '_snmp_cache', '_cached_name',
+    )
+
+    def __init__(self, ip, description, kunde, serial, *args, port=161, community='public',
+                 snmp_timeout=SNMP_TIMEOUT, snmp_retries=SNMP_RETRIES, **kwargs):
         self.ip = ip
         self.kunde = kunde
         self.serial = serial
@@ -193,54 +351,148 @@ class Printer():
         self.port = port
         self.community = community
         self.version = __version__
+        self._auth = cmdgen.CommunityData(self.community)
+        self._snmp_cache = {}
+        self._cached_name = None
         self.status = 'ERROR'
+        # explizit statt pysnmp Standard (1s Timeout, 5 Retries), damit nicht
+        # erreichbare Drucker nicht mehrere Sekunden pro Request blockieren.
+        # Hostnamen werden dabei einmalig je Drucker aufgelöst
+        try:
+            self._transport = cmdgen.UdpTransportTarget(
+                (self.ip, self.port), timeout=snmp_timeout, retries=snmp_retries)
+        except PySnmpError as e:
+            # nicht auflösbarer Hostname betrifft nur diesen Drucker, nicht den ganzen Durchlauf
+            logger.error(f'Adresse nicht auflösbar, {self.description} [{self.ip}]: {e}')
+            self._transport = None
+            self.status = 'TIMEOUT'
+            return
         self.status = 'OK' if self.ping() else 'TIMEOUT'
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_oid_tables()
+
+    @classmethod
+    def _build_oid_tables(cls):
+        """ Ermittelt einmalig pro Klasse die OIDs der skalaren Werte und die
+        (name, capacity, remaining) OIDs aller Verbrauchsmaterialien, statt
+        sie bei jeder Abfrage per getattr zusammenzusuchen """
+        cls._SCALAR_OIDS = tuple((field, getattr(cls, oid_attr)) for field, oid_attr in cls.scalar_fields)
+
+        fields = ('name', 'capacity', 'remaining')
+        cls._OID_TABLE = {}
+        cls._MANUAL_OID_TABLE = {}
+        for consumable in PrinterConsumable.Consumable:
+            prefix = f'oid_{consumable.value.lower()}'
+            oids = tuple(getattr(cls, f'{prefix}_{field}', None) for field in fields)
+            # nur initialisieren, falls oid_<consumable>_capacity gesetzt ist
+            # Platzhalter-Kapazität (NO_OID) liefert nie einen Wert, daher auslassen
+            if oids[1] and oids[1] != NO_OID: cls._OID_TABLE[consumable] = oids
+        # manuelle OIDs nur für die in MANUAL_CONSUMABLES gelisteten Consumables,
+        # auch wenn weitere oid_<consumable>_*_manual geerbt werden
+        for consumable in cls.MANUAL_CONSUMABLES:
+            prefix = f'oid_{consumable.value.lower()}'
+            cls._MANUAL_OID_TABLE[consumable] = tuple(
+                getattr(cls, f'{prefix}_{field}_manual', None) for field in fields)
+
+        # Supplies-Zellen: OID -> Zeile; bestimmt, ob und wie weit ein Walk lohnt
+        cls._SUPPLIES_CELLS = {}
+        for table in (cls._OID_TABLE, cls._MANUAL_OID_TABLE):
+            for oid in (oid for oids in table.values() for oid in oids if oid):
+                column, _, row = oid.rpartition('.')
+                if column in cls.oid_supplies_columns: cls._SUPPLIES_CELLS[oid] = int(row)
+
     def to_json(self) -> dict:
-        x = self.__dict__
-        consumables = x.pop('consumables', list())
-        x['consumables'] = list()
-        for consumable in consumables:
-            x['consumables'].append(consumable.__dict__)
+        # nur die Felder des Backend-Schemas; vor initialize_values (Timeout, Ping)
+        # noch nicht gesetzte Felder werden wie bisher weggelassen
+        x = {field: getattr(self, field) for field in self.report_fields if hasattr(self, field)}
+        x['consumables'] = [consumable.to_json() for consumable in getattr(self, 'consumables', [])]
         return x
 
+    def snmp_oids(self) -> list:
+        """ Hilfsfunktion die alle für initialize_values benötigten
+        OIDs zurückgibt, um sie gesammelt abzufragen """
+        oids = [oid for _, oid in self._SCALAR_OIDS]
+        for consumable_oids in self._OID_TABLE.values():
+            oids.extend(consumable_oids)
+        # manuelle OIDs der Varianten gleich mit abfragen
+        for consumable_oids in self._MANUAL_OID_TABLE.values():
+            oids.extend(consumable_oids)
+        return oids
+
     def initialize_values(self):
         logger.info(f'[>] Initialisiere Drucker {self.description} [{self.ip}]...')
-        self.name = self.query_snmp(self.oid_printer_name)
-        self.model = self.query_snmp(self.oid_printer_model)
-        #self.serial = self.query_snmp(self.oid_printer_serial)
-        self.meta = self.query_snmp(self.oid_printer_meta)
+        # alle OIDs gesammelt abfragen statt einem Request pro OID;
+        # Verbrauchsmaterialien per Walk, was dabei fehlt per GET
+        # oid_printer_name wurde bereits durch ping() abgefragt
+        self._snmp_cache = {self.oid_printer_name: self._cached_name} if self._cached_name else {}
+        oids = self.snmp_oids()
+        self.walk_supplies(oids)
+        values = self.query_snmp_many(oids)
 
-        self.print_count = self.query_snmp(self.oid_print_count)
-        self.print_color = self.query_snmp(self.oid_print_color)
-        self.print_mono = self.query_snmp(self.oid_print_mono)
+        for field, oid in self._SCALAR_OIDS:
+            setattr(self, field, values.get(oid))
 
         # Fallback um print_count vollständig zu initialisieren
         if not self.print_count:
-            self.print_count = (self.print_color or 0) + (self.print_mono or 0)
+            self.print_count = (parse_count(self.print_color) or 0) + (parse_count(self.print_mono) or 0)
             if not self.print_count: self.print_count = None
 
         self.consumables = []
 
-        for consumable in PrinterConsumable.Consumable:
-            # wenn oid_<consumable>_capacity gesetzt ist (also falls Variable vorhanden und
-            # mit Wert belegt ist), initialisieren
-            if getattr(self, f'oid_{consumable.value.lower()}_capacity'):
-                logger.debug(f'Detected {consumable.value} as being present in OIDs')
-                oid_name = getattr(self, f'oid_{consumable.value.lower()}_name')
-                oid_capacity = getattr(self, f'oid_{consumable.value.lower()}_capacity')
-                oid_remaining = getattr(self, f'oid_{consumable.value.lower()}_remaining')
-                consumable_instance = PrinterConsumable(
-                    name=self.query_snmp(oid_name),
-                    capacity=self.query_snmp(oid_capacity),
-                    remaining=self.query_snmp(oid_remaining),
-                    type=consumable
-                )
-
-                if consumable_instance.initialized: self.consumables.append(consumable_instance)
+        # enthält nur Consumables, deren oid_<consumable>_capacity gesetzt ist
+        for consumable, (oid_name, oid_capacity, oid_remaining) in self._OID_TABLE.items():
+            logger.debug(f'Detected {consumable.value} as being present in OIDs')
+            capacity = values.get(oid_capacity)
+            # ohne gültige Kapazität würde das Consumable ohnehin verworfen;
+            # Objekt erst gar nicht anlegen
+            if not (isinstance(capacity, int) and capacity > 0):
+                logger.warning(f'[{consumable.value}] – no data – did not initialize properly!')
+                continue
+
+            self.consumables.append(PrinterConsumable(
+                name=values.get(oid_name),
+                capacity=capacity,
+                remaining=values.get(oid_remaining),
+                consumable_type=consumable
+            ))
+
+        self._init_manual_consumables()
+
+    def _init_manual_consumables(self):
+        """ Initialisiert die Verbrauchsmaterialien aus MANUAL_CONSUMABLES;
+        diese melden keine Füllstände, sondern nur ob Restmenge vorhanden ist """
+        existing = {consumable.type for consumable in self.consumables}
+        for manual_consumable in self.MANUAL_CONSUMABLES:
+            # check consumable has not been initialized automatically previously
+            if manual_consumable.value in existing:
+                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
+                    'already added during the automatic routine')
+                continue
+
+            # initialize based on manual OID overwrites; values are served
+            # from the batched query in initialize_values
+            name_oid, capacity_oid, remaining_oid = self._MANUAL_OID_TABLE[manual_consumable]
+            consumable = PrinterConsumable(
+                consumable_type=manual_consumable,
+                name=self.query_snmp(name_oid),
+                capacity=1,
+                remaining=1 if self.has_remaining(self.query_snmp(capacity_oid), self.query_snmp(remaining_oid)) else 0
+            )
+            if consumable.initialized:
+                self.consumables.append(consumable)
+                existing.add(consumable.type)
+
+    @staticmethod
+    def has_remaining(capacity, remaining) -> bool:
+        """ Printer-MIB Sonderwerte: Kapazität unbekannt (-2)
+        und Restmenge vorhanden (-3) """
+        return capacity == -2 and remaining == -3
 
     def ping(self) -> bool:
-        if self.query_snmp(self.oid_printer_name):
+        self._cached_name = self.query_snmp(self.oid_printer_name)
+        if self._cached_name:
             logger.info(f'[>] Drucker online, {self.description} [{self.ip}]')
             return True
         logger.error(f'Drucker nicht erreichbar oder "oid_printer_name" nicht auflösbar, {self.description} [{self.ip}]')
@@ -250,18 +502,18 @@ class Printer():
         """ SNMP Abfrage für angegebene OID """
 
         if self.status == 'TIMEOUT': return None
-        if not oid: return None
+        if not oid or oid == NO_OID: return None
+        if oid in self._snmp_cache: return self._snmp_cache[oid]
 
         logger.debug(f'Querying {oid}...')
-        cmdGen = cmdgen.CommandGenerator()
-        error_indicator, error_status, error_index, binds = cmdGen.getCmd(
+        # nur numerische OIDs; MIB Auflösung der Antworten (lookupMib) ist unnötig
+        error_indicator, error_status, error_index, binds = get_command_generator().getCmd(
             #cmdgen.CommunityData(self.community, mpModel=0),
-            cmdgen.CommunityData(self.community),
-            cmdgen.UdpTransportTarget((self.ip, self.port)), oid)
+            self._auth, self._transport, object_identity(oid), lookupMib=False)
 
         # Check for errors and print out results
         if error_indicator:
-            logger.error(f'{error_indicator} for {self.ip}')
+            self.handle_error_indication(error_indicator)
             return None
 
         elif error_status:
@@ -270,12 +522,114 @@ class Printer():
 
         for name, val in binds:
             logger.debug(f'{name} = {val}')
-            # Evaluiert, ob kein Wert an OID; kein Wert an OID = -1
-            if val is None or isinstance(val, rfc1905.NoSuchInstance) or isinstance(val, rfc1905.NoSuchObject):
-                logger.debug(f'No OID such object!...')
-                return None
-            logger.debug(f'Returning OID value: {val}')
-            return str(val).rstrip('\x00')
+            return self.parse_snmp_value(val)
+
+    def query_snmp_many(self, oids: list) -> dict:
+        """ SNMP Abfrage mehrerer OIDs mit möglichst wenigen Requests;
+        gibt ein Dictionary OID -> Wert zurück. Ergebnisse werden bis zum
+        nächsten initialize_values in self._snmp_cache vorgehalten """
+
+        oids = [oid for oid in dict.fromkeys(oids) if oid and oid != NO_OID]
+        pending = [oid for oid in oids if oid not in self._snmp_cache]
+
+        for i in range(0, len(pending), self.snmp_max_oids):
+            if self.status == 'TIMEOUT': break
+            chunk = pending[i:i + self.snmp_max_oids]
+            logger.debug(f'Querying {len(chunk)} OIDs...')
+            error_indicator, error_status, error_index, binds = get_command_generator().getCmd(
+                self._auth, self._transport, *map(object_identity, chunk), lookupMib=False)
+
+            if error_indicator:
+                self.handle_error_indication(error_indicator)
+                break
+
+            elif error_status:
+                # z.B. tooBig oder SNMPv1 noSuchName – Fallback auf Einzelabfragen
+                logger.warning(f'{error_status} for {len(chunk)} OIDs at {self.ip}, querying one by one')
+                for oid in chunk:
+                    self._snmp_cache[oid] = self.query_snmp(oid)
+                continue
+
+            # Antwort enthält die Varbinds in der Reihenfolge der Anfrage
+            for oid, (name, val) in zip(chunk, binds):
+                logger.debug(f'{name} = {val}')
+                self._snmp_cache[oid] = self.parse_snmp_value(val)
+
+        return {oid: self._snmp_cache.get(oid) for oid in oids}
+
+    def walk_table(self, base_oids, max_rep=25, max_rows=0) -> dict:
+        """ GETBULK Walk über eine oder mehrere Tabellenspalten;
+        gibt ein Dictionary OID -> Wert zurück """
+
+        if self.status == 'TIMEOUT': return {}
+
+        logger.debug(f'Walking {", ".join(base_oids)}...')
+        error_indicator, error_status, error_index, table = get_command_generator().bulkCmd(
+            self._auth, self._transport, 0, max_rep, *map(object_identity, base_oids),
+            lexicographicMode=False, maxRows=max_rows, lookupMib=False)
+
+        if error_indicator:
+            self.handle_error_indication(error_indicator)
+            return {}
+
+        elif error_status:
+            logger.error(f'{error_status} while walking {", ".join(base_oids)} at {self.ip}')
+            return {}
+
+        values = {}
+        for row in table:
+            for name, val in row:
+                # Spalte bereits vollständig durchlaufen
+                if isinstance(val, rfc1905.EndOfMibView): continue
+                logger.debug(f'{name} = {val}')
+                values[str(name)] = self.parse_snmp_value(val)
+        return values
+
+    def handle_error_indication(self, error_indicator) -> None:
+        """ Protokolliert einen SNMP Fehler; nach einem Timeout gilt der
+        Drucker als nicht erreichbar, sodass alle weiteren Abfragen sofort
+        enden statt jeweils erneut auf den Timeout zu warten """
+        logger.error(f'{error_indicator} for {self.ip}')
+        if isinstance(error_indicator, errind.RequestTimedOut): self.status = 'TIMEOUT'
+
+    def walk_supplies(self, oids: list) -> dict:
+        """ Fragt die Verbrauchsmaterial OIDs über einen Walk der
+        prtMarkerSupplies Spalten ab, sofern das weniger Requests
+        braucht als die GETs in query_snmp_many """
+        pending = [oid for oid in dict.fromkeys(oids) if oid and oid != NO_OID and oid not in self._snmp_cache]
+        cells = [oid for oid in pending if oid in self._SUPPLIES_CELLS]
+        if not cells: return {}
+
+        # ein Walk liefert alle Zeilen bis zum höchsten konfigurierten Index; bei
+        # hohen, dünn belegten Indizes sind die GETs der einzelnen Zellen günstiger
+        rows = max(self._SUPPLIES_CELLS[oid] for oid in cells)
+        walk_requests = -(-rows // self.snmp_max_repetitions) + -(-(len(pending) - len(cells)) // self.snmp_max_oids)
+        if walk_requests >= -(-len(pending) // self.snmp_max_oids): return {}
+
+        table = self.walk_table(self.oid_supplies_columns, max_rep=self.snmp_max_repetitions, max_rows=rows)
+        # nur konfigurierte Zellen übernehmen; walk_table protokolliert die Werte bereits
+        values = {oid: val for oid, val in table.items() if oid in self._SUPPLIES_CELLS}
+        self._snmp_cache.update(values)
+        return values
+
+    @staticmethod
+    def parse_snmp_value(val):
+        """ Wandelt einen SNMP Rückgabewert typgerecht um; Zähler und
+        Integer als int, Zeichenketten als str """
+        # Evaluiert, ob kein Wert an OID; kein Wert an OID = -1
+        if val is None or isinstance(val, NO_SNMP_VALUE):
+            logger.debug(f'No OID such object!...')
+            return None
+        logger.debug(f'Returning OID value: {val}')
+        # Integer32, Counter32/64, Gauge32, Unsigned32, TimeTicks
+        if isinstance(val, univ.Integer): return int(val)
+        if isinstance(val, univ.OctetString):
+            value = bytes(val).rstrip(b'\x00')
+            try:
+                return value.decode('utf-8')
+            except UnicodeDecodeError:
+                return value.decode('iso-8859-1')
+        return str(val)
 
     def get_consumable(self, name: str) -> PrinterConsumable:
         """ Hilfsfunktion um Consumable zurückzugeben """
@@ -285,14 +639,19 @@ class Printer():
         return '- nicht konfiguriert -'
 
 
+Printer._build_oid_tables()
+
+
 class Xerox(Printer):
     """ Druckervariante normaler Xerox Drucker,
     der als Printer-Referenzobjekt dient. """
-    pass
+    __slots__ = ()
 
 
 class XeroxC8130(Printer):
     """ Druckervariante Xerox Altalink C8130 (unserer) """
+    __slots__ = ()
+
     # Resttonbehälter/Waste Cartridge
     oid_waste_name = '1.3.6.1.2.1.43.11.1.1.6.1.9'
     oid_waste_capacity = '1.3.6.1.2.1.43.11.1.1.8.1.9'
@@ -308,34 +667,11 @@ class XeroxC8130(Printer):
 
 
 class XeroxBW(Printer):
+    __slots__ = ()
 
-    def initialize_values(self):
-        Printer.initialize_values(self)
-        consumables = []
-        # Append consumables in this list with a manually overwritten type
-        manual_consumables = [
-            PrinterConsumable.Consumable.FUSER
-        ]
-        remaining_status = lambda capacity, remaining: "1" if self.query_snmp(remaining) == "-3" and self.query_snmp(capacity) == "-2" else "0"
-
-        for manual_consumable in manual_consumables:
-            # check consumable has not been initialized automatically previously
-            if manual_consumable.value in [consumable.type for consumable in self.consumables]:
-                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
-                    'already added during the automatic routine')
-                continue
-
-            # initialize based on manual OID overwrites
-            capacity_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_capacity_manual')
-            remaining_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_remaining_manual')
-            name_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_name_manual')
-            consumable = PrinterConsumable(
-                type=manual_consumable,
-                name=self.query_snmp(name_oid),
-                capacity="1",
-                remaining=remaining_status(capacity_oid, remaining_oid)
-            )
-            if consumable.initialized: self.consumables.append(consumable)
+    MANUAL_CONSUMABLES = [
+        PrinterConsumable.Consumable.FUSER
+    ]
 
     oid_printer_name = '1.3.6.1.2.1.1.1.0'
 
@@ -396,6 +732,8 @@ class XeroxBW(Printer):
 
 class XeroxWC3225(Printer):
     """ Druckervariante Xerox WorkCentre 3225 """
+    __slots__ = ()
+
     oid_black_drum_name = '1.3.6.1.2.1.43.11.1.1.6.1.2'
     oid_black_drum_remaining = '1.3.6.1.2.1.43.11.1.1.9.1.2'
     oid_black_drum_capacity = '1.3.6.1.2.1.43.11.1.1.8.1.2'
@@ -406,33 +744,11 @@ class XeroxWC3225(Printer):
 
 class XeroxVLB405(XeroxBW):
     """ Druckervariante Xerox VersaLink B400 und B405 """
-    def initialize_values(self):
-        Printer.initialize_values(self)
-        consumables = []
-        # Append consumables in this list with a manually overwritten type
-        manual_consumables = [
-            PrinterConsumable.Consumable.CLEANER
-        ]
-        remaining_status = lambda capacity, remaining: "1" if self.query_snmp(remaining) == "-3" and self.query_snmp(capacity) == "-2" else "0"
-
-        for manual_consumable in manual_consumables:
-            # check consumable has not been initialized automatically previously
-            if manual_consumable.value in [consumable.type for consumable in self.consumables]:
-                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
-                    'already added during the automatic routine')
-                continue
+    __slots__ = ()
 
-            # initialize based on manual OID overwrites
-            capacity_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_capacity_manual')
-            remaining_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_remaining_manual')
-            name_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_name_manual')
-            consumable = PrinterConsumable(
-                type=manual_consumable,
-                name=self.query_snmp(name_oid),
-                capacity="1",
-                remaining=remaining_status(capacity_oid, remaining_oid)
-            )
-            if consumable.initialized: self.consumables.append(consumable)
+    MANUAL_CONSUMABLES = [
+        PrinterConsumable.Consumable.CLEANER
+    ]
 
     # Wartungs Kit
     oid_cleaner_name_manual = '1.3.6.1.2.1.43.11.1.1.6.1.40'
@@ -442,35 +758,13 @@ class XeroxVLB405(XeroxBW):
 
 class XeroxVLC405(Printer):
     """ Druckervariante Xerox VersaLink C405 """
-    def initialize_values(self):
-        Printer.initialize_values(self)
-        consumables = []
-        # Append consumables in this list with a manually overwritten type
-        manual_consumables = [
-            PrinterConsumable.Consumable.FUSER,
-            PrinterConsumable.Consumable.CLEANER,
-            PrinterConsumable.Consumable.WASTE
-        ]
-        remaining_status = lambda capacity, remaining: "1" if self.query_snmp(remaining) == "-3" and self.query_snmp(capacity) == "-2" else "0"
+    __slots__ = ()
 
-        for manual_consumable in manual_consumables:
-            # check consumable has not been initialized automatically previously
-            if manual_consumable.value in [consumable.type for consumable in self.consumables]:
-                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
-                    'already added during the automatic routine')
-                continue
-
-            # initialize based on manual OID overwrites
-            capacity_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_capacity_manual')
-            remaining_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_remaining_manual')
-            name_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_name_manual')
-            consumable = PrinterConsumable(
-                type=manual_consumable,
-                name=self.query_snmp(name_oid),
-                capacity="1",
-                remaining=remaining_status(capacity_oid, remaining_oid)
-            )
-            if consumable.initialized: self.consumables.append(consumable)
+    MANUAL_CONSUMABLES = [
+        PrinterConsumable.Consumable.FUSER,
+        PrinterConsumable.Consumable.CLEANER,
+        PrinterConsumable.Consumable.WASTE
+    ]
 
     oid_cyan_toner_name = '1.3.6.1.2.1.43.11.1.1.6.1.4'
     oid_cyan_toner_capacity = '1.3.6.1.2.1.43.11.1.1.8.1.4'
@@ -531,36 +825,14 @@ class XeroxVLC405(Printer):
 
 
 class XeroxVLC505S(XeroxVLC405):
-    def initialize_values(self):
-        Printer.initialize_values(self)
-        consumables = []
-        # Append consumables in this list with a manually overwritten type
-        manual_consumables = [
-            PrinterConsumable.Consumable.FUSER,
-            PrinterConsumable.Consumable.CLEANER,
-            PrinterConsumable.Consumable.WASTE,
-            PrinterConsumable.Consumable.TRANSFER
-        ]
-        remaining_status = lambda capacity, remaining: "1" if self.query_snmp(remaining) == "-3" and self.query_snmp(capacity) == "-2" else "0"
+    __slots__ = ()
 
-        for manual_consumable in manual_consumables:
-            # check consumable has not been initialized automatically previously
-            if manual_consumable.value in [consumable.type for consumable in self.consumables]:
-                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
-                    'already added during the automatic routine')
-                continue
-
-            # initialize based on manual OID overwrites
-            capacity_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_capacity_manual')
-            remaining_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_remaining_manual')
-            name_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_name_manual')
-            consumable = PrinterConsumable(
-                type=manual_consumable,
-                name=self.query_snmp(name_oid),
-                capacity="1",
-                remaining=remaining_status(capacity_oid, remaining_oid)
-            )
-            if consumable.initialized: self.consumables.append(consumable)
+    MANUAL_CONSUMABLES = [
+        PrinterConsumable.Consumable.FUSER,
+        PrinterConsumable.Consumable.CLEANER,
+        PrinterConsumable.Consumable.WASTE,
+        PrinterConsumable.Consumable.TRANSFER
+    ]
 
     # Einzugsrolle Behälter 1
     oid_transfer_name = None
@@ -629,6 +901,8 @@ class XeroxVLC505S(XeroxVLC405):
 
 class HP(Printer):
     """ Druckervariante regulärer HP LaserJet Color. """
+    __slots__ = ()
+
     oid_printer_name = '1.3.6.1.2.1.43.5.1.1.16.1'
 
     # Usage/Prints Details
@@ -638,6 +912,7 @@ class HP(Printer):
 
 
 class HPBW(Printer):
+    __slots__ = ()
 
     # Usage/Prints Details
     oid_print_count = '1.3.6.1.4.1.11.2.3.9.4.2.1.1.16.1.9.0'
@@ -680,12 +955,16 @@ class HPBW(Printer):
 
 
 class HPMFP(HP):
+    __slots__ = ()
+
     oid_print_count = '1.3.6.1.2.1.43.10.2.1.4.1.1'
     oid_print_mono = '1.3.6.1.2.1.43.10.2.1.4.1.1'
 
 
 class HPM426(HP):
     """ HP LJ MFP M426 """
+    __slots__ = ()
+
     oid_print_count = '1.3.6.1.2.1.43.10.2.1.4.1.1'
     oid_print_color = None
     oid_print_mono = '1.3.6.1.2.1.43.10.2.1.4.1.1'
@@ -746,6 +1025,8 @@ class HPM426(HP):
 
 
 class KCSW(Printer):
+    __slots__ = ()
+
     # Kyocera spezifisch Overall Prints
     oid_print_count = '1.3.6.1.4.1.1347.42.2.1.1.1.6.1.1'
     oid_print_mono = '1.3.6.1.4.1.1347.42.2.1.1.1.6.1.1'
@@ -788,39 +1069,26 @@ class KCSW(Printer):
 
 
 class DICL(Printer):
+    __slots__ = ()
+
     # Develop Ineo 450 / äquivalente Kyocera Produkte
 
-    def initialize_values(self):
-        Printer.initialize_values(self)
-        consumables = []
-        # Append consumables in this list with a manually overwritten type
-        manual_consumables = [
-            PrinterConsumable.Consumable.WASTE
-        ]
-        remaining_status = lambda capacity, remaining: "1" if self.query_snmp(remaining) == "-3" and self.query_snmp(capacity) == "-2" else "0"
+    MANUAL_CONSUMABLES = [
+        PrinterConsumable.Consumable.WASTE
+    ]
 
-        for manual_consumable in manual_consumables:
-            # check consumable has not been initialized automatically previously
-            if manual_consumable.value in [consumable.type for consumable in self.consumables]:
-                logger.warning(f'Manual Consumable {manual_consumable.value} initialization failed, because it was ' \
-                    'already added during the automatic routine')
-                continue
+    def snmp_oids(self) -> list:
+        # Kopienzähler im selben Request wie die übrigen OIDs abfragen
+        return Printer.snmp_oids(self) + [self.oid_copies_color, self.oid_copies_monochrome]
 
-            # initialize based on manual OID overwrites
-            capacity_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_capacity_manual')
-            remaining_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_remaining_manual')
-            name_oid = getattr(self, f'oid_{manual_consumable.value.lower()}_name_manual')
-            consumable = PrinterConsumable(
-                type=manual_consumable,
-                name=self.query_snmp(name_oid),
-                capacity="1",
-                remaining=remaining_status(capacity_oid, remaining_oid)
-            )
-            if consumable.initialized: self.consumables.append(consumable)
-        
-        if self.print_color is None: return  # if not initialized casting None to int below will raise an error
-        self.print_color = int(self.print_color) + int(self.query_snmp(self.oid_copies_color))
-        self.print_mono = int(self.print_mono) + int(self.query_snmp(self.oid_copies_monochrome))
+    def initialize_values(self):
+        Printer.initialize_values(self)
+        if self.print_color is None: return  # printer counters not initialized, nothing to add copies to
+        # Kopienzähler stammen aus dem gesammelten Request; fehlende Werte zählen als 0
+        copies_color = parse_count(self.query_snmp(self.oid_copies_color)) or 0
+        copies_mono = parse_count(self.query_snmp(self.oid_copies_monochrome)) or 0
+        self.print_color = (parse_count(self.print_color) or 0) + copies_color
+        self.print_mono = (parse_count(self.print_mono) or 0) + copies_mono
 
     oid_printer_name = '1.3.6.1.2.1.1.1.0'
 
@@ -899,6 +1167,8 @@ class DICL(Printer):
 
 
 class HPM725BW(HPBW):
+    __slots__ = ()
+
     # Skrip Eintrag 'Bandreiniger' ist bei diesem Modell 'Wartungskit'
     # Bandreiniger auf -1
     oid_cleaner_name = '1.3.6.1'
@@ -908,6 +1178,7 @@ class HPM725BW(HPBW):
 
 class XeroxPhaser(Printer):
     """ erstellt für Durckervariante Xerox Phaser 7760 """
+    __slots__ = ()
 
     # Fixiereinheit/Fuser Kit
     oid_fuser_name = '1.3.6.1.2.1.43.11.1.1.6.1.6'
@@ -965,6 +1236,8 @@ class XeroxPhaser(Printer):
 
 
 class oki(Printer):
+    __slots__ = ()
+
     # Usage/Prints Details
     oid_print_count = '1.3.6.1.4.1.2001.1.1.1.1.11.1.10.150.1.6.102'
     oid_print_color = '1.3.6.1.4.1.2001.1.1.1.1.11.1.10.170.1.6.1'
@@ -992,6 +1265,8 @@ class oki(Printer):
 
 
 class okiC911(Printer):
+    __slots__ = ()
+
 	# Resttonbehälter/Waste Cartridge
     oid_waste_name = '1.3.6.1.2.1.43.11.1.1.6.1.11'
     oid_waste_capacity = '1.3.6.1.2.1.43.11.1.1.8.1.11'
@@ -1012,12 +1287,24 @@ class okiC911(Printer):
     oid_cleaner_remaining = None
 
 
-def report_data(printer: Printer) -> None:
-    """ Report Printer to Backend """
+def report_data(printer: Printer, timestamp: datetime = None, settings: dict = None) -> None:
+    """ Report Printer to Backend; ``timestamp`` ist der gemeinsame
+    Zeitpunkt des Durchlaufs, ansonsten wird die aktuelle Zeit verwendet.
+    ``settings`` sind die Report-Einstellungen des Durchlaufs (report_settings) """
+    settings = settings or {}
     data = printer.to_json()
-    data.setdefault('timestamp', datetime.now(timezone.utc).isoformat())
-    logger.info(data)
-    r = requests.post(BACKEND, proxies=PROXIES, headers=HEADERS, json=data, verify=True)
+    # orjson serialisiert datetime direkt als RFC 3339 (wie isoformat())
+    data.setdefault('timestamp', timestamp or datetime.now(timezone.utc))
+    # HEADERS sind bereits in den Session-Headern hinterlegt
+    body, headers = orjson.dumps(data), dict(settings.get('headers', {}))
+    # gesendeten JSON Body protokollieren, Zeitstempel also im ISO Format
+    logger.info(body.decode('utf-8'))
+    if settings.get('gzip', GZIP):
+        # wiederholte Schlüssel komprimieren gut; niedrige Stufe reicht
+        body = gzip.compress(body, compresslevel=1)
+        headers['Content-Encoding'] = 'gzip'
+    r = get_session().post(
+        BACKEND, proxies=settings.get('proxies', PROXIES), headers=headers, data=body, verify=True)
 
     if(r.status_code == 201):
         logger.info(f'[>] Reporting data for {printer.description} [{printer.serial}] to backend | {r.status_code}')
@@ -1027,111 +1314,230 @@ def report_data(printer: Printer) -> None:
     logger.debug(r.text)
 
 
+# Config-Variante (kleingeschrieben) -> Druckerklasse
+VARIANTS = {
+    'xerox': Xerox,
+    'xeroxbw': XeroxBW,
+    'hp': HP,
+    'hpbw': HPBW,
+    'hpmfp': HPMFP,
+    'hpm426': HPM426,
+    'kcsw': KCSW,
+    'dicl': DICL,
+    'hpm725bw': HPM725BW,
+    'xeroxc8130': XeroxC8130,
+    'xeroxwc3225': XeroxWC3225,
+    'xeroxphaser': XeroxPhaser,
+    'xeroxvlc405': XeroxVLC405,
+    'xeroxvlc505s': XeroxVLC505S,
+    'xeroxvlb405': XeroxVLB405,
+    'oki': oki,
+    'okic911': okiC911,
+}
+
+
 def decide_printer(*args, **kwargs):
     """ Gibt das entsprechende Printer Objekt für
     einen Drucker <variant> zurück. """
     variant = kwargs.get('variant').lower()
-    if(variant == 'xerox'): return Xerox(**kwargs)
-    elif(variant == 'xeroxbw'): return XeroxBW(**kwargs)
-    elif(variant == 'hp'): return HP(**kwargs)
-    elif(variant == 'hpbw'): return HPBW(**kwargs)
-    elif(variant == 'hpmfp'): return HPMFP(**kwargs)
-    elif(variant == 'hpm426'): return HPM426(**kwargs)
-    elif(variant == 'kcsw'): return KCSW(**kwargs)
-    elif(variant == 'dicl'): return DICL(**kwargs)
-    elif(variant == 'hpm725bw'): return HPM725BW(**kwargs)
-    elif(variant == 'xeroxc8130'): return XeroxC8130(**kwargs)
-    elif(variant == 'xeroxwc3225'): return XeroxWC3225(**kwargs)
-    elif(variant == 'xeroxphaser'): return XeroxPhaser(**kwargs)
-    elif(variant == 'xeroxvlc405'): return XeroxVLC405(**kwargs)
-    elif(variant == 'xeroxvlc505s'): return XeroxVLC505S(**kwargs)
-    elif(variant == 'xeroxvlb405'): return XeroxVLB405(**kwargs)
-    elif(variant == 'oki'): return oki(**kwargs)
-    elif(variant == 'okiC911'): return okiC911(**kwargs)
-    logger.warning(f'Ungültige Variante: "{variant}" für Drucker mit IP: {kwargs.get("ip")}')
-    return Printer(**kwargs)
+    if variant not in VARIANTS:
+        logger.warning(f'Ungültige Variante: "{variant}" für Drucker mit IP: {kwargs.get("ip")}')
+    return VARIANTS.get(variant, Printer)(**kwargs)
+
+
+def format_count(count) -> str:
+    """ Zählerstand mit Tausendertrennzeichen; fehlende Werte werden als 0,
+    nicht numerische Werte unverändert ausgegeben """
+    value = parse_count(count)
+    if value is None and count is not None: return str(count)
+    return f'{value or 0:,}'
+
+
+# Abschnitte der Verbrauchsmaterialien in print_status: (Überschrift, ((Label, Consumable), ...))
+STATUS_CONSUMABLES = (
+    ('Toner values (TONER)', (
+        ('[C]', 'CYAN_TONER'), ('[M]', 'MAGENTA_TONER'), ('[Y]', 'YELLOW_TONER'), ('[K]', 'BLACK_TONER'))),
+    ('Drum values (DRUM)', (
+        ('[C]', 'CYAN_DRUM'), ('[M]', 'MAGENTA_DRUM'), ('[Y]', 'YELLOW_DRUM'), ('[K]', 'BLACK_DRUM'))),
+    ('Misc', (
+        ('CLEANER', 'CLEANER'), ('FUSER', 'FUSER'), ('WASTE', 'WASTE'), ('TRANSFER', 'TRANSFER'))),
+)
 
 
 def print_status(printer: Printer) -> None:
-    print(f'########## Report for {printer.description} ##########')
-    print('[i] Printer Overview')
-    print(f' |-- Name: {printer.name}')
-    print(f' |-- Model: {printer.model}')
-    print(f' |-- IP address: {printer.ip}')
-    print(f' |-- Serial number: {printer.serial}')
-    print(f' |-- Client: {printer.kunde}')
-    print(f' |-- Description: {printer.description}')
-    print(f'[i] Printer statistics')
-    print(f' |-- Mono: {int(printer.print_mono or 0):,}')
-    print(f' |-- Color: {int(printer.print_color or 0):,}')
-    print(f' |-- Total: {int(printer.print_count or 0):,}')
-    print(f'[i] Toner values (TONER)')
-    print(f' |-- [C] {printer.get_consumable("CYAN_TONER")}')
-    print(f' |-- [M] {printer.get_consumable("MAGENTA_TONER")}')
-    print(f' |-- [Y] {printer.get_consumable("YELLOW_TONER")}')
-    print(f' |-- [K] {printer.get_consumable("BLACK_TONER")}')
-    print(f'[i] Drum values (DRUM)')
-    print(f' |-- [C] {printer.get_consumable("CYAN_DRUM")}')
-    print(f' |-- [M] {printer.get_consumable("MAGENTA_DRUM")}')
-    print(f' |-- [Y] {printer.get_consumable("YELLOW_DRUM")}')
-    print(f' |-- [K] {printer.get_consumable("BLACK_DRUM")}')
-    print(f'[i] Misc')
-    print(f' |-- CLEANER {printer.get_consumable("CLEANER")}')
-    print(f' |-- FUSER {printer.get_consumable("FUSER")}')
-    print(f' |-- WASTE {printer.get_consumable("WASTE")}')
-    print(f' |-- TRANSFER {printer.get_consumable("TRANSFER")}')
-
-
-def initialize_printers() -> list:
+    # Ausgabe gesammelt schreiben statt einem print() pro Zeile
+    lines = [
+        f'########## Report for {printer.description} ##########',
+        '[i] Printer Overview',
+        f' |-- Name: {printer.name}',
+        f' |-- Model: {printer.model}',
+        f' |-- IP address: {printer.ip}',
+        f' |-- Serial number: {printer.serial}',
+        f' |-- Client: {printer.kunde}',
+        f' |-- Description: {printer.description}',
+        f'[i] Printer statistics',
+        f' |-- Mono: {format_count(printer.print_mono)}',
+        f' |-- Color: {format_count(printer.print_color)}',
+        f' |-- Total: {format_count(printer.print_count)}',
+    ]
+    for section, entries in STATUS_CONSUMABLES:
+        lines.append(f'[i] {section}')
+        lines.extend(f' |-- {label} {printer.get_consumable(consumable)}' for label, consumable in entries)
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
+def _log_report_error(printer: Printer, future) -> None:
+    """ Protokolliert Fehler eines im Hintergrund gesendeten Reports """
+    error = future.exception()
+    if error is not None:
+        logger.error(f'Could not report data for {printer.description} [{printer.serial}] to backend | {error!r}',
+                     exc_info=error)
+
+
+def poll_printer(printer: Printer, args: argparse.Namespace, reporter: ThreadPoolExecutor = None,
+                 timestamp: datetime = None, settings: dict = None) -> Printer:
+    """ Fragt einen Drucker entsprechend der CLI Argumente ab
+    und meldet die Werte ggf. an das Backend. Fehler werden pro Drucker
+    abgefangen, damit ein Drucker nicht die übrigen Abfragen abbricht """
+    try:
+        if args.report:
+            if printer.status == 'OK':
+                printer.initialize_values()
+            if reporter is None:
+                report_data(printer, timestamp, settings)
+            else:
+                # Report im eigenen Pool senden, damit der Worker ohne auf
+                # das Backend zu warten den nächsten Drucker abfragt
+                reporter.submit(report_data, printer, timestamp, settings).add_done_callback(
+                    partial(_log_report_error, printer))
+        elif args.debug:
+            printer.ping()
+            printer.initialize_values()
+        elif args.ping:
+            printer.ping()
+    except Exception:
+        logger.exception(f'Unbehandelter Fehler bei Drucker {printer.description} [{printer.ip}]')
+        printer.status = 'ERROR'
+    return printer
+
+
+def ip_sort_key(ip: str) -> tuple:
+    """ Sortierschlüssel für Drucker-IPs; Drucker im selben Subnetz werden
+    direkt nacheinander abgefragt, sodass ARP-/NAT-Einträge auf dem Weg
+    noch warm sind. Hostnamen werden hinter den IP-Adressen einsortiert """
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return (1, 0, ip)
+    return (0, address.version, address.packed)
+
+
+def _load_config(path: str = CONFIG_FILE) -> dict:
+    """ Liest die Konfiguration ein; erneut nur, wenn sich die Datei
+    geändert hat, sodass --interval Änderungen im nächsten Durchlauf übernimmt """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == mtime: return cached[1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    # orjson erwartet UTF-8 ohne BOM (z.B. von Windows Editoren gesetzt)
+    if data.startswith(codecs.BOM_UTF8): data = data[len(codecs.BOM_UTF8):]
+    config = orjson.loads(data)
+    _config_cache[path] = (mtime, config)
+    return config
+
+
+def report_settings(data: dict) -> dict:
+    """ Report-Einstellungen (Token, Proxy, gzip) aus der Config; werden
+    pro Durchlauf an report_data übergeben statt globale Werte zu ändern,
+    sodass noch laufende Reports des vorherigen Durchlaufs ihre behalten """
+    proxy = data.get('proxy') or ''
+    return {
+        'headers': {'Authorization': f'Token {data.get("token")}'},
+        'proxies': {'http': proxy, 'https': proxy},
+        'gzip': bool(data.get('gzip', GZIP)),
+    }
+
+
+def initialize_printers(executor: ThreadPoolExecutor = None, data: dict = None) -> list:
     """ Hilfsfunktion die über Config iteriert und alle
-    Drucker initialisiert zurückgibt """
-    global PROXIES
-    global HEADERS
-    with open('printer_config.txt') as f:
-        data = json.loads(f.read())
-
-    PROXIES = {'http': data.get('proxy') or '', 'https': data.get('proxy') or ''}
-    HEADERS.setdefault('Authorization', f'Token {data.get("token")}')
-
-    printers = []
-    for printer in data['printers']:
-        printers.append(decide_printer(
+    Drucker initialisiert zurückgibt. Der Erreichbarkeits-Ping beim
+    Anlegen läuft parallel, sodass sich Timeouts nicht aufsummieren """
+    if data is None: data = _load_config()
+
+    def create_printer(printer: dict) -> Printer:
+        return decide_printer(
             kunde=data['client'],
             ip=printer['ip'],
             serial=printer['serial'],
             description=printer['description'],
             variant=printer['variant']
-        ))
-    return printers
+        )
 
+    entries = sorted(data['printers'], key=lambda p: ip_sort_key(p['ip']))
+    if executor is not None:
+        return list(executor.map(create_printer, entries))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(create_printer, entries))
+
+
+def run_once(args: argparse.Namespace, executor: ThreadPoolExecutor, reporter: ThreadPoolExecutor) -> None:
+    """ Ein Abfragedurchlauf über alle konfigurierten Drucker """
+    data = _load_config()
+    printers = initialize_printers(executor, data)
+    # Drucker parallel abfragen; die Wartezeit auf SNMP/HTTP Antworten
+    # überlappt so, statt sich pro Drucker aufzusummieren
+    poll = partial(poll_printer, args=args, reporter=reporter, timestamp=datetime.now(timezone.utc),
+                   settings=report_settings(data))
+    for printer in executor.map(poll, printers):
+        if args.debug and printer.status != 'ERROR':
+            print_status(printer)
+
+            print(printer.to_json())
+            print('#########################################################')
+
+
+def main():
+    os.chdir(os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__))))
+    _configure_logging()
 
-if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--report', help='Report raw printer data to backend', action='store_true')
     parser.add_argument('--debug', help='Verbose debug output, no reporting', action='store_true')
     parser.add_argument('--ping', help='Check printer alive status, no reporting', action='store_true')
+    parser.add_argument('--workers', help=f'Number of printers polled in parallel '
+                                          f'(default: "workers" from config, else {MAX_WORKERS})', type=int)
+    parser.add_argument('--interval', help='Keep running and poll again every INTERVAL seconds (default: run once)',
+                        type=int, default=0)
     args = parser.parse_args()
-    if not any(vars(args).values()): parser.error('No arguments provided.')
+    if not (args.report or args.debug or args.ping): parser.error('No arguments provided.')
+    # Manche Drucker vertragen nur wenige gleichzeitige Anfragen; per Config begrenzbar
+    if args.workers is None: args.workers = int(_load_config().get('workers', MAX_WORKERS))
+    if args.workers < 1: parser.error('--workers must be at least 1.')
+    if args.interval < 0: parser.error('--interval must not be negative.')
+
+    stop = threading.Event()
+    if args.interval:
+        # SIGTERM (z.B. docker stop) beendet den Dienst nach dem laufenden Durchlauf
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
 
     logger.info('##################################################')
     logger.info(f'[>] RAUSYS SNMP Printer Monitoring and Reporting, v{__version__}')
     logger.info(f'[>] Innovative Managed Services and IT partner: rausys.de')
 
-    printers = initialize_printers()
-    for printer in printers:
-        if args.report:
-            if printer.status == 'OK':
-                printer.initialize_values()
-            report_data(printer)
-        elif args.debug:
-            printer.ping()
-            printer.initialize_values()
-            print_status(printer)
+    # Pools (und damit die SNMP Engines je Thread) bleiben über alle Durchläufe
+    # bestehen. Der Abfrage-Pool wird zuerst geschlossen, der Report-Pool
+    # danach (offene Reports abwarten)
+    with ThreadPoolExecutor(max_workers=REPORT_WORKERS) as reporter, \
+            ThreadPoolExecutor(max_workers=args.workers) as executor:
+        while True:
+            run_once(args, executor, reporter)
+            if not args.interval or stop.wait(args.interval): break
 
-            print(printer.to_json())
-            print('#########################################################')
-        elif args.ping:
-            printer.ping()
+
+if __name__ == '__main__':
+    main()
 
 #a = Printer('10.100.20.110', 'Xerox', 'Beispielbeschreibung', 'Beispielkunde')
 #a.printStatus()